@@ -14,6 +14,8 @@
 
 import math
 import warnings
+from functools import reduce
+from operator import gt, lt, mul
 import numpy as np
 
 import paddle
@@ -38,18 +40,70 @@ class LearningRateDecay:
     but need to use one of it's implementation.
     """
 
+    # keys of state_dict whose value may be a Variable and has to be
+    # converted to a python scalar when saving. None means all keys are checked.
+    _variable_keys = None
+
     def __init__(self, begin=0, step=1, dtype='float32'):
         self.step_num = begin
         self.step_size = step
         self.dtype = dtype
+        self._lr_var = None
+        # learning rates of the first steps, filled by ``precompute``.
+        # self._lr_table[i] is the learning rate of step i + self._lr_table_start
+        self._lr_table = None
+        self._lr_table_start = 0
+        self._state_keys()
 
     def __call__(self):
-        lr = self.step()
+        """
+        Return the learning rate of the current step and move to the next step.
+
+        The learning rate Variable is created on the first call and then updated
+        in place, so every call returns the same Variable and a value kept from
+        an earlier step changes along with it. Use ``float(lr)`` to keep the
+        value of a single step.
+        """
+        lr = self._precomputed_lr()
+        if lr is None:
+            lr = self.step()
         if isinstance(lr, float):
-            lr = self.create_lr_var(lr)
+            lr = self._update_lr_var(lr)
         self.step_num += self.step_size
         return lr
 
+    def _update_lr_var(self, lr):
+        """
+        write lr into the learning rate variable returned by ``__call__`` .
+        The variable is created on the first call and reused afterwards,
+        so no new global variable is registered for each step.
+
+        Args:
+            lr: learning rate
+        Returns:
+            learning rate variable
+        """
+        if self._lr_var is None:
+            self._lr_var = self.create_lr_var(lr)
+        else:
+            paddle.assign(
+                paddle.full([1], float(lr), dtype=self.dtype), self._lr_var
+            )
+        return self._lr_var
+
+    def _precomputed_lr(self):
+        """
+        return the learning rate of the current step from the table built by
+        ``precompute`` , or None if there is no entry for it.
+        """
+        table = self._lr_table
+        if table is None:
+            return None
+        index = self.step_num - self._lr_table_start
+        if 0 <= index < len(table):
+            return float(table[index])
+        return None
+
     def create_lr_var(self, lr):
         """
         convert lr from float to variable
@@ -59,8 +113,6 @@ class LearningRateDecay:
         Returns:
             learning rate variable
         """
-        from .. import layers
-
         lr = paddle.static.create_global_var(
             name=unique_name.generate("learning_rate"),
             shape=[1],
@@ -78,13 +130,16 @@ class LearningRateDecay:
 
         It is a subset of self.__dict__ .
         """
-        self._state_keys()
+        if not hasattr(self, 'keys'):
+            self._state_keys()
         state_dict = {}
         for key in self.keys:
             if key not in self.__dict__:
                 continue
             value = self.__dict__[key]
-            if isinstance(value, Variable):
+            if (
+                self._variable_keys is None or key in self._variable_keys
+            ) and isinstance(value, Variable):
                 assert (
                     value.size == 1
                 ), "the size of Variable in state_dict must be 1, but its size is {} with shape {}".format(
@@ -98,6 +153,7 @@ class LearningRateDecay:
     def _state_keys(self):
         """
         set the keys in self.__dict__ that are needed to be saved.
+        It is called once in __init__ and the result is cached in self.keys .
         """
         self.keys = ['step_num']
 
@@ -105,7 +161,8 @@ class LearningRateDecay:
         """
         Loads the schedulers state.
         """
-        self._state_keys()
+        if not hasattr(self, 'keys'):
+            self._state_keys()
         for key in self.keys:
             if key in state_dict:
                 self.__dict__[key] = state_dict[key]
@@ -202,30 +259,75 @@ class PolynomialDecay(LearningRateDecay):
         self.end_learning_rate = end_learning_rate
         self.power = power
         self.cycle = cycle
+        self._inv_decay_steps = 1.0 / float(decay_steps)
+        self._power_is_one = float(power) == 1.0
+        # for a python number learning_rate the amplitude of the decay is a
+        # constant, a Variable learning_rate is handled in step()
+        self._lr_range = (
+            float(learning_rate) - float(end_learning_rate)
+            if isinstance(learning_rate, (int, float))
+            else None
+        )
 
     def step(self):
+        # The schedule only depends on python scalars, so compute it on the
+        # host and let ``__call__`` wrap the result into a Variable once.
+        # If learning_rate is a Variable, the same expression falls back to
+        # tensor ops.
+        if not self.cycle and self.step_num >= self.decay_steps:
+            # the schedule has reached its end and stays there
+            return float(self.end_learning_rate)
+
         tmp_step_num = self.step_num
-        tmp_decay_steps = self.decay_steps
         if self.cycle:
-            div_res = paddle.ceil(
-                self.create_lr_var(tmp_step_num / float(self.decay_steps))
-            )
+            div_res = math.ceil(tmp_step_num / float(self.decay_steps))
 
             if tmp_step_num == 0:
-                div_res = self.create_lr_var(1.0)
-            tmp_decay_steps = self.decay_steps * div_res
+                div_res = 1.0
+            # a true division keeps the ratio exactly 1 at the end of a cycle,
+            # multiplying by an inverse may round above it
+            factor = 1.0 - tmp_step_num / (self.decay_steps * div_res)
         else:
-            tmp_step_num = self.create_lr_var(
-                tmp_step_num
-                if tmp_step_num < self.decay_steps
-                else self.decay_steps
-            )
-
-        decayed_lr = (self.learning_rate - self.end_learning_rate) * (
-            (1 - tmp_step_num / tmp_decay_steps) ** self.power
-        ) + self.end_learning_rate
+            factor = 1.0 - tmp_step_num * self._inv_decay_steps
+        if not self._power_is_one:
+            factor = factor**self.power
+
+        lr_range = self._lr_range
+        if lr_range is None:
+            lr_range = self.learning_rate - self.end_learning_rate
+        decayed_lr = lr_range * factor + self.end_learning_rate
         return decayed_lr
 
+    def precompute(self, total_steps):
+        """
+        Compute the learning rates of steps ``[0, total_steps)`` at once, so that
+        later steps in this range only look the value up instead of evaluating
+        the schedule. Steps out of the range are computed as usual.
+
+        Args:
+            total_steps(int): The number of steps to precompute.
+        Returns:
+            None
+        """
+        if self._lr_range is None:
+            raise TypeError(
+                "precompute only supports learning_rate of type int or float, but received {}".format(
+                    type(self.learning_rate)
+                )
+            )
+        steps = np.arange(total_steps, dtype='float64')
+        if self.cycle:
+            div_res = np.maximum(np.ceil(steps / float(self.decay_steps)), 1.0)
+            decay_steps = self.decay_steps * div_res
+        else:
+            steps = np.minimum(steps, self.decay_steps)
+            decay_steps = float(self.decay_steps)
+        lr_table = (
+            self._lr_range * (1 - steps / decay_steps) ** self.power
+            + self.end_learning_rate
+        )
+        self._lr_table = lr_table.astype(self.dtype)
+
 
 class NoamDecay(LearningRateDecay):
     r"""
@@ -287,17 +389,48 @@ class NoamDecay(LearningRateDecay):
         self.learning_rate = learning_rate
         self.d_model = d_model
         self.warmup_steps = warmup_steps
+        # constant factors of the schedule, computed once
+        self._d_scale = self.d_model**-0.5
+        self._warm_scale = self.warmup_steps**-1.5
 
     def step(self):
-        from .. import layers
-
-        a = self.create_lr_var(self.step_num**-0.5)
-        b = self.create_lr_var((self.warmup_steps**-1.5) * self.step_num)
-        lr_value = (
-            self.learning_rate * (self.d_model**-0.5) * paddle.minimum(a, b)
-        )
+        a = self.step_num**-0.5
+        b = self._warm_scale * self.step_num
+        if isinstance(b, Variable):
+            # warmup_steps is a Variable, so the minimum has to be a tensor op
+            min_value = paddle.minimum(self.create_lr_var(a), b)
+        else:
+            min_value = min(a, b)
+        lr_value = self.learning_rate * self._d_scale * min_value
         return lr_value
 
+    def precompute(self, total_steps):
+        """
+        Compute the learning rates of steps ``[1, total_steps)`` at once, so that
+        later steps in this range only look the value up instead of evaluating
+        the schedule. Steps out of the range are computed as usual, so step 0
+        still raises ZeroDivisionError in ``step`` .
+
+        Args:
+            total_steps(int): The number of steps to precompute.
+        Returns:
+            None
+        """
+        for name in ['learning_rate', 'd_model', 'warmup_steps']:
+            if isinstance(getattr(self, name), Variable):
+                raise TypeError(
+                    "precompute doesn't support {} of type Variable".format(
+                        name
+                    )
+                )
+        # step 0 is not defined for this schedule, leave it to step()
+        steps = np.arange(1, total_steps, dtype='float64')
+        a = steps**-0.5
+        b = self._warm_scale * steps
+        lr_table = self.learning_rate * self._d_scale * np.minimum(a, b)
+        self._lr_table = lr_table.astype(self.dtype)
+        self._lr_table_start = 1
+
 
 class LinearLrWarmup(LearningRateDecay):
     """
@@ -386,19 +519,50 @@ class LinearLrWarmup(LearningRateDecay):
         self.lr_ratio_before_warmup = (float(end_lr) - float(start_lr)) / float(
             warmup_steps
         )
+        # the learning rate after warm up is a constant unless it comes from
+        # a nested LearningRateDecay, so convert it only once.
+        self._base_lr = (
+            None
+            if isinstance(learning_rate, LearningRateDecay)
+            else float(learning_rate)
+        )
 
     def step(self):
-        base_lr = self.learning_rate
-        if isinstance(self.learning_rate, LearningRateDecay):
-            base_lr = base_lr()
-
-        from .. import layers
+        if self._base_lr is None:
+            # the nested scheduler keeps stepping during warm up as well
+            base_lr = self.learning_rate()
+        else:
+            base_lr = self._base_lr
 
         if self.step_num < self.warmup_steps:
             return self.lr_ratio_before_warmup * self.step_num + self.start_lr
         else:
             return base_lr
 
+    def precompute(self, total_steps):
+        """
+        Compute the learning rates of steps ``[0, total_steps)`` at once, so that
+        later steps in this range only look the value up instead of evaluating
+        the schedule. Steps out of the range are computed as usual.
+
+        Args:
+            total_steps(int): The number of steps to precompute.
+        Returns:
+            None
+        """
+        if self._base_lr is None:
+            raise TypeError(
+                "precompute doesn't support learning_rate of type LearningRateDecay, "
+                "because the nested scheduler has to be stepped on every call"
+            )
+        steps = np.arange(total_steps, dtype='float64')
+        lr_table = np.where(
+            steps < self.warmup_steps,
+            self.lr_ratio_before_warmup * steps + self.start_lr,
+            self._base_lr,
+        )
+        self._lr_table = lr_table.astype(self.dtype)
+
 
 class ReduceLROnPlateau(LearningRateDecay):
     """
@@ -480,6 +644,10 @@ class ReduceLROnPlateau(LearningRateDecay):
 
     """
 
+    # "best_loss" holds the loss Variable passed to step(), while "learning_rate"
+    # is saved from self._lr_value and needs no conversion.
+    _variable_keys = {'best_loss'}
+
     def __init__(
         self,
         learning_rate,
@@ -504,7 +672,7 @@ class ReduceLROnPlateau(LearningRateDecay):
             raise ValueError(
                 'new_lr = origin_lr * decay_rate and decay_rate should be < 1.0.'
             )
-        self.decay_rate = self.create_lr_var(decay_rate)
+        self.decay_rate = float(decay_rate)
 
         threshold_mode = threshold_mode.lower()
         if threshold_mode not in ['rel', 'abs']:
@@ -524,20 +692,33 @@ class ReduceLROnPlateau(LearningRateDecay):
                 % type(learning_rate)
             )
 
+        # python value of learning_rate, kept in sync with it so that reading
+        # the current lr does not need a device to host copy
+        self._lr_value = float(learning_rate)
+        if isinstance(learning_rate, Variable):
+            # the lr is updated in place later, so don't write into the
+            # caller's tensor
+            learning_rate = self.create_lr_var(self._lr_value)
         self.learning_rate = learning_rate
         self.verbose = verbose
         self.patience = patience
         self.threshold = threshold
         self.threshold_mode = threshold_mode
         self.cooldown = cooldown
-        self.min_lr = self.create_lr_var(min_lr)
+        self.min_lr = float(min_lr)
         self.eps = eps
 
         self.cooldown_counter = 0
         self.best_loss = None
+        # the value a new loss has to beat, updated together with best_loss
+        self._best_threshold = None
         self.num_bad_epochs = 0
         self.epoch_num = 0
 
+        # mode is fixed after construction, so select the comparison used
+        # by _is_better once here.
+        self._cmp = lt if self.mode == 'min' else gt
+
     # "cooldown_counter / best_loss / num_bad_epochs / epoch_num / learning_rate" will be stored.
     def _state_keys(self):
         self.keys = [
@@ -548,6 +729,24 @@ class ReduceLROnPlateau(LearningRateDecay):
             'learning_rate',
         ]
 
+    def state_dict(self):
+        state_dict = super().state_dict()
+        if 'learning_rate' in state_dict:
+            state_dict['learning_rate'] = self._lr_value
+        return state_dict
+
+    def set_state_dict(self, state_dict):
+        lr_var = self.learning_rate
+        super().set_state_dict(state_dict)
+        lr_value = float(self.learning_rate)
+        # keep the Variable that may already be held by the optimizer
+        self.learning_rate = lr_var
+        self._set_lr(lr_value)
+        self._update_best_threshold()
+
+    # [aliases] Compatible with old method names
+    set_dict = set_state_dict
+
     def __call__(self):
         if not isinstance(self.learning_rate, Variable):
             self.learning_rate = self.create_lr_var(self.learning_rate)
@@ -570,21 +769,21 @@ class ReduceLROnPlateau(LearningRateDecay):
             Please refer to the example of current LearningRateDecay.
         """
 
-        # loss.size must be 1
-        check_type(loss, 'loss', Variable, 'ReduceLROnPlateau.step')
-        assert np.prod(loss.shape) == 1, (
-            "The number of elements of loss should be 1, but the current loss.shape is {}, whose number of elements is not 1. "
-            "Maybe that you should call paddle.mean to process it first.".format(
-                loss.shape
+        # loss.size must be 1, these checks are skipped with python -O
+        if __debug__:
+            check_type(loss, 'loss', Variable, 'ReduceLROnPlateau.step')
+            assert reduce(mul, loss.shape, 1) == 1, (
+                f"The number of elements of loss should be 1, but the current loss.shape is {loss.shape}, whose number of elements is not 1. "
+                "Maybe that you should call paddle.mean to process it first."
             )
-        )
 
         self.epoch_num += 1
         if self.cooldown_counter > 0:
             self.cooldown_counter -= 1
         else:
-            if self.best_loss is None or self._is_better(loss, self.best_loss):
+            if self.best_loss is None or self._is_better(loss):
                 self.best_loss = loss
+                self._update_best_threshold()
                 self.num_bad_epochs = 0
             else:
                 self.num_bad_epochs += 1
@@ -592,32 +791,49 @@ class ReduceLROnPlateau(LearningRateDecay):
             if self.num_bad_epochs > self.patience:
                 self.cooldown_counter = self.cooldown
                 self.num_bad_epochs = 0
-                new_lr = paddle.maximum(
-                    self.learning_rate * self.decay_rate, self.min_lr
-                )
-                if self.learning_rate - new_lr > self.eps:
+                # read the python shadow of the lr, a Variable would need a
+                # device to host copy
+                cur_lr = self._lr_value
+                new_lr_val = max(cur_lr * self.decay_rate, self.min_lr)
+                if cur_lr - new_lr_val > self.eps:
                     if self.verbose:
                         print(
-                            'Epoch {}: reducing learning rate from {} to {}.'.format(
-                                self.epoch_num,
-                                float(self.learning_rate),
-                                float(new_lr),
-                            )
+                            f'Epoch {self.epoch_num}: reducing learning rate from {cur_lr} to {new_lr_val}.'
                         )
-                    self.learning_rate = new_lr
+                    self._set_lr(new_lr_val)
 
-    def _is_better(self, current, best):
-        if self.mode == 'min' and self.threshold_mode == 'rel':
-            return current < best - best * self.threshold
+    def _set_lr(self, lr_value):
+        """
+        set the learning rate to the python number lr_value. Once the learning
+        rate is a Variable it is shared with the optimizer, so it is updated in
+        place instead of being replaced.
+        """
+        if isinstance(self.learning_rate, Variable):
+            paddle.assign(
+                paddle.full([1], lr_value, dtype=self.learning_rate.dtype),
+                self.learning_rate,
+            )
+        else:
+            self.learning_rate = lr_value
+        self._lr_value = lr_value
+
+    def _is_better(self, current):
+        return self._cmp(current, self._best_threshold)
 
-        elif self.mode == 'min' and self.threshold_mode == 'abs':
-            return current < best - self.threshold
+    def _update_best_threshold(self):
+        if self.best_loss is None:
+            self._best_threshold = None
+            return
 
-        elif self.mode == 'max' and self.threshold_mode == 'rel':
-            return current > best + best * self.threshold
+        if self.threshold_mode == 'rel':
+            delta = self.best_loss * self.threshold
+        else:
+            delta = self.threshold
 
+        if self.mode == 'min':
+            self._best_threshold = self.best_loss - delta
         else:
-            return current > best + self.threshold
+            self._best_threshold = self.best_loss + delta
 
 
 class _LearningRateEpochDecay(LearningRateDecay):
@@ -646,6 +862,7 @@ class _LearningRateEpochDecay(LearningRateDecay):
         self.dtype = dtype
         if dtype is None:
             self.dtype = "float32"
+        self._state_keys()
         self.learning_rate = self.create_lr_var(self.base_lr)
 
         self.epoch()
@@ -655,6 +872,17 @@ class _LearningRateEpochDecay(LearningRateDecay):
     def _state_keys(self):
         self.keys = ['epoch_num', 'learning_rate']
 
+    def set_state_dict(self, state_dict):
+        lr_var = self.learning_rate
+        super().set_state_dict(state_dict)
+        lr = self.learning_rate
+        # keep the Variable that may already be held by the optimizer
+        self.learning_rate = lr_var
+        self._set_lr(lr)
+
+    # [aliases] Compatible with old method names
+    set_dict = set_state_dict
+
     def __call__(self):
         """
         Return last computed learning rate on current epoch.
@@ -672,7 +900,22 @@ class _LearningRateEpochDecay(LearningRateDecay):
         else:
             self.epoch_num = epoch
 
-        self.learning_rate = self.get_lr()
+        self._set_lr(self.get_lr())
+
+    def _set_lr(self, lr):
+        """
+        set the learning rate to lr. A python number is written into the
+        current learning rate Variable instead of creating a new one.
+        """
+        if isinstance(self.learning_rate, Variable) and isinstance(
+            lr, (float, int)
+        ):
+            paddle.assign(
+                paddle.full([1], float(lr), dtype=self.dtype),
+                self.learning_rate,
+            )
+        else:
+            self.learning_rate = lr
 
     def get_lr(self):
         raise NotImplementedError
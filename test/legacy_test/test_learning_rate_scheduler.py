@@ -234,6 +234,146 @@ class TestLearningRateDecayDygraph(unittest.TestCase):
                 "current learning rate is different before and after set_dict",
             )
 
+    def test_ReduceLROnPlateau_lr_var(self):
+        with fluid.dygraph.guard():
+            loss = paddle.to_tensor(1.0)
+            user_lr = fluid.dygraph.to_variable(
+                np.array([1.0]).astype("float32")
+            )
+            for learning_rate in [1.0, user_lr]:
+                sched = fluid.dygraph.ReduceLROnPlateau(
+                    learning_rate=learning_rate, decay_rate=0.5, patience=0
+                )
+                lr_var = sched()
+
+                # the second step doesn't improve and reduces the lr
+                sched.step(loss)
+                sched.step(loss)
+                self.assertIs(sched(), lr_var)
+                np.testing.assert_allclose(
+                    lr_var.numpy().item(), 0.5, rtol=1e-05
+                )
+
+                state_dict = sched.state_dict()
+                state_dict['learning_rate'] = 0.25
+                sched.set_dict(state_dict)
+                self.assertIs(sched(), lr_var)
+                np.testing.assert_allclose(
+                    lr_var.numpy().item(), 0.25, rtol=1e-05
+                )
+
+            # the Variable passed in by the user is never written to
+            np.testing.assert_allclose(user_lr.numpy().item(), 1.0)
+
+    def test_LearningRateEpochDecay_lr_var(self):
+        class HalveDecay(
+            fluid.dygraph.learning_rate_scheduler._LearningRateEpochDecay
+        ):
+            def get_lr(self):
+                return self.base_lr * 0.5**self.epoch_num
+
+        with fluid.dygraph.guard():
+            sched = HalveDecay(1.0)
+            lr_var = sched()
+            sched.epoch()
+            self.assertIs(sched(), lr_var)
+            np.testing.assert_allclose(lr_var.numpy().item(), 0.5, rtol=1e-05)
+
+            sched_test = HalveDecay(1.0)
+            lr_var_test = sched_test()
+            sched_test.set_dict(sched.state_dict())
+            self.assertIs(sched_test(), lr_var_test)
+            np.testing.assert_allclose(
+                lr_var_test.numpy().item(), 0.5, rtol=1e-05
+            )
+
+            sched_test.epoch()
+            self.assertIs(sched_test(), lr_var_test)
+            np.testing.assert_allclose(
+                lr_var_test.numpy().item(), 0.25, rtol=1e-05
+            )
+
+    def test_ReduceLROnPlateau_threshold(self):
+        # mode, threshold_mode, losses, num_bad_epochs after each loss,
+        # a loss fed after set_dict and the num_bad_epochs it gives
+        cases = [
+            (
+                'min',
+                'rel',
+                [2.0, 1.85, 1.75, 1.75, 1.75],
+                [0, 1, 0, 1, 0],
+                1.6,
+                1,
+            ),
+            (
+                'min',
+                'abs',
+                [2.0, 1.85, 1.85, 1.85, 1.85],
+                [0, 0, 1, 0, 1],
+                1.7,
+                0,
+            ),
+            (
+                'max',
+                'rel',
+                [2.0, 2.15, 2.25, 2.25, 2.25],
+                [0, 1, 0, 1, 0],
+                2.4,
+                1,
+            ),
+            (
+                'max',
+                'abs',
+                [2.0, 2.15, 2.15, 2.15, 2.15],
+                [0, 0, 1, 0, 1],
+                2.3,
+                0,
+            ),
+        ]
+        with fluid.dygraph.guard():
+            for (
+                mode,
+                threshold_mode,
+                losses,
+                bad_epochs,
+                probe,
+                probe_bad_epochs,
+            ) in cases:
+
+                def make_scheduler():
+                    return fluid.dygraph.ReduceLROnPlateau(
+                        learning_rate=1.0,
+                        mode=mode,
+                        decay_rate=0.5,
+                        patience=1,
+                        threshold=0.1,
+                        threshold_mode=threshold_mode,
+                    )
+
+                sched = make_scheduler()
+                for loss, num_bad_epochs in zip(losses, bad_epochs):
+                    sched.step(paddle.to_tensor(loss))
+                    self.assertEqual(
+                        sched.num_bad_epochs,
+                        num_bad_epochs,
+                        msg='mode {}, threshold_mode {}, loss {}'.format(
+                            mode, threshold_mode, loss
+                        ),
+                    )
+                # the lr is reduced once, at the only step exceeding patience
+                np.testing.assert_allclose(
+                    sched().numpy().item(), 0.5, rtol=1e-05
+                )
+
+                # best_loss is restored as a python float
+                sched_test = make_scheduler()
+                sched_test.set_dict(sched.state_dict())
+                sched_test.step(paddle.to_tensor(probe))
+                self.assertEqual(sched_test.num_bad_epochs, probe_bad_epochs)
+                np.testing.assert_allclose(
+                    sched_test().numpy().item(), 0.5, rtol=1e-05
+                )
+
     def test_NoamDecay(self):
         with fluid.dygraph.guard():
             d_model = 0.01
@@ -255,16 +395,106 @@ class TestLearningRateDecayDygraph(unittest.TestCase):
                     ),
                 )
 
+    def test_PolynomialDecay(self):
+        with fluid.dygraph.guard():
+            # power 0.5 checks that the end of each cycle (e.g. step 55)
+            # gives exactly end_learning_rate, a negative factor would make
+            # the lr complex
+            for cycle, power in [(True, 2.0), (False, 2.0), (True, 0.5)]:
+                lr = fluid.dygraph.PolynomialDecay(
+                    learning_rate=1.0,
+                    decay_steps=5,
+                    end_learning_rate=0.0001,
+                    power=power,
+                    cycle=cycle,
+                )
+                for step in range(61):
+                    right_result = polynomial_decay(
+                        1.0, step, 5, 0.0001, power=power, cycle=cycle
+                    )
+                    fluid_result = lr()
+
+                    self.assertAlmostEqual(
+                        right_result,
+                        fluid_result.numpy().item(),
+                        places=5,
+                        msg='Failed lr scheduler in step {}, Python result is {}, Fluid result is {}'.format(
+                            step, right_result, fluid_result.numpy().item()
+                        ),
+                    )
+
+    def test_lr_var_reused(self):
+        with fluid.dygraph.guard():
+            lr = fluid.dygraph.PolynomialDecay(1.0, 10, 0.0, power=1.0)
+            first = lr()
+            np.testing.assert_allclose(first.numpy().item(), 1.0, rtol=1e-05)
+            second = lr()
+            self.assertIs(first, second)
+            # the Variable from the first step now holds the second lr
+            np.testing.assert_allclose(first.numpy().item(), 0.9, rtol=1e-05)
+
+    def test_precompute(self):
+        with fluid.dygraph.guard():
+
+            def make_schedulers():
+                return [
+                    fluid.dygraph.PolynomialDecay(1.0, 5, 0.0001, 2.0, True),
+                    fluid.dygraph.PolynomialDecay(1.0, 5, 0.0001, 1.0, False),
+                    fluid.dygraph.NoamDecay(0.01, 5, learning_rate=2.0),
+                    fluid.dygraph.LinearLrWarmup(0.5, 4, 0.0, 0.4),
+                ]
+
+            for lr, lr_precomputed in zip(
+                make_schedulers(), make_schedulers()
+            ):
+                # steps after the table fall back to step()
+                lr_precomputed.precompute(8)
+                for step in range(12):
+                    np.testing.assert_allclose(
+                        lr_precomputed().numpy().item(),
+                        lr().numpy().item(),
+                        rtol=1e-05,
+                    )
+
+            with self.assertRaises(TypeError):
+                lr = fluid.dygraph.LinearLrWarmup(
+                    fluid.dygraph.PolynomialDecay(1.0, 5), 4, 0.0, 0.4
+                )
+                lr.precompute(8)
+
+            def to_var(value):
+                return fluid.dygraph.to_variable(
+                    np.array([value]).astype("float32")
+                )
+
+            with self.assertRaises(TypeError):
+                lr = fluid.dygraph.PolynomialDecay(to_var(1.0), 5)
+                lr.precompute(8)
+
+            with self.assertRaises(TypeError):
+                lr = fluid.dygraph.NoamDecay(to_var(0.01), 5)
+                lr.precompute(8)
+
+            with self.assertRaises(TypeError):
+                lr = fluid.dygraph.NoamDecay(0.01, to_var(5.0))
+                lr.precompute(8)
+
+            # step 0 is not in the table and fails like step() does
+            lr = fluid.dygraph.NoamDecay(0.01, 5, begin=0)
+            lr.precompute(8)
+            with self.assertRaises(ZeroDivisionError):
+                lr()
+
     def test_LinearLrWarmup(self):
         with fluid.dygraph.guard():
-            lr = fluid.layers.polynomial_decay(
+            decay = fluid.layers.polynomial_decay(
                 learning_rate=1.0,
                 decay_steps=10,
                 end_learning_rate=0.0,
                 power=1.0,
             )
             lr = fluid.layers.linear_lr_warmup(
-                learning_rate=lr, warmup_steps=2, start_lr=0.0, end_lr=1.0
+                learning_rate=decay, warmup_steps=2, start_lr=0.0, end_lr=1.0
             )
 
             right_result = [0.5, 0.9, 0.8, 0.7, 0.6]
@@ -274,6 +504,13 @@ class TestLearningRateDecayDygraph(unittest.TestCase):
                 np.testing.assert_allclose(
                     t.numpy().item(), right_result[i], rtol=1e-05
                 )
+                # the warm up lr is the outer scheduler's Variable, later
+                # ones are the nested scheduler's Variable
+                self.assertIs(t, lr._lr_var if i == 0 else decay._lr_var)
+            # the outer Variable is not written to after warm up
+            np.testing.assert_allclose(
+                lr._lr_var.numpy().item(), 0.5, rtol=1e-05
+            )
 
             with self.assertRaises(TypeError):
                 lr = fluid.layers.linear_lr_warmup(